@@ -28,6 +28,11 @@ import collections
 import yaml
 import regex
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 import synapse.exc as s_exc
 import synapse.lib.const as s_const
 import synapse.lib.msgpack as s_msgpack
@@ -484,6 +489,30 @@ def getDirSize(*paths):
 
     return realsum, apprsum
 
+# orjson decodes integers outside of 64 bits as floats, so input containing
+# a run of 19+ digits (which could be such an integer) is left to the stdlib
+jsonbigbyts = regex.compile(rb'\d{19}')
+jsonbigtext = regex.compile(r'\d{19}')
+
+def jsonloads(text):
+    '''
+    Deserialize a JSON document from bytes or str.
+
+    orjson is used when it is installed and the result is known to match
+    json.loads(). Input orjson may decode inexactly or rejects (large integers,
+    NaN, Infinity, non UTF-8 encodings) is decoded with json.loads().
+    '''
+    if orjson is not None:
+
+        bigre = jsonbigtext if isinstance(text, str) else jsonbigbyts
+        if bigre.search(text) is None:
+            try:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
+                pass
+
+    return json.loads(text)
+
 def jsload(*paths):
     with genfile(*paths) as fd:
         byts = fd.read()
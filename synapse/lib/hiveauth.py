@@ -1,4 +1,11 @@
+import os
+import sys
+import hmac
+import time
+import asyncio
+import hashlib
 import logging
+import collections
 
 import synapse.exc as s_exc
 import synapse.common as s_common
@@ -12,6 +19,9 @@ import synapse.lib.crypto.passwd as s_passwd
 
 logger = logging.getLogger(__name__)
 
+# seconds a successful password check may be reused for the same password
+PASSWD_CACHE_TIME = 1.0
+
 reqValidRules = s_config.getJsValidator({
     'type': 'array',
     'items': {
@@ -32,12 +42,61 @@ def getShadow(passwd):  # pragma: no cover
     hashed = s_common.guid((salt, passwd))
     return (salt, hashed)
 
+def _internperm(perm):
+    '''
+    Return a permission (or rule path) as a tuple of interned strings.
+    '''
+    return tuple(map(sys.intern, perm))
+
 def textFromRule(rule):
     text = '.'.join(rule[1])
     if not rule[0]:
         text = '!' + text
     return text
 
+class RuleMaps:
+    '''
+    Rule paths grouped by path length for first-match permission lookups.
+
+    A rule which follows a rule for a prefix of its own path can never be the
+    first match and is dropped.  Any two remaining rules which match the same
+    permission are then ordered shortest path last, so checking the longest
+    path lengths first gives the same result as scanning the rules in order.
+    '''
+    def __init__(self, rules=()):
+
+        paths = {}
+        for allow, path in rules:
+
+            path = _internperm(path)
+            if any(path[:size] in paths for size in range(len(path) + 1)):
+                continue
+
+            paths[path] = allow
+
+        bylen = collections.defaultdict(dict)
+        for path, allow in paths.items():
+            bylen[len(path)][path] = allow
+
+        # (size, {path: allow}) tuples with the longest paths first
+        self.maps = tuple(sorted(bylen.items(), key=lambda item: item[0], reverse=True))
+
+    def get(self, perm):
+        '''
+        Return the allow value of the first matching rule or None.
+        '''
+        permlen = len(perm)
+        for size, paths in self.maps:
+
+            if size > permlen:
+                continue
+
+            allow = paths.get(perm[:size])
+            if allow is not None:
+                return allow
+
+        return None
+
 class Auth(s_nexus.Pusher):
     '''
     Auth is a user authentication and authorization stored in a Hive.  Users
@@ -110,16 +169,28 @@ class Auth(s_nexus.Pusher):
         self.rolesbyname = {}
         self.authgates = {}
 
+        # roleiden -> set of useridens granted the role
+        self.usersbyrole = collections.defaultdict(set)
+
         self.allrole = None
         self.rootuser = None
 
+        # each user and role only opens its own subtree so they may load concurrently
         roles = await self.node.open(('roles',))
-        for _, node in roles:
-            await self._addRoleNode(node)
+        roles = await asyncio.gather(*[HiveRole.anit(node, self) for _, node in roles])
+
+        self.rolesbyiden.update((role.iden, role) for role in roles)
+        self.rolesbyname.update((role.name, role) for role in roles)
 
         users = await self.node.open(('users',))
-        for _, node in users:
-            await self._addUserNode(node)
+        users = await asyncio.gather(*[HiveUser.anit(node, self) for _, node in users])
+
+        self.usersbyiden.update((user.iden, user) for user in users)
+        self.usersbyname.update((user.name, user) for user in users)
+
+        for user in users:
+            for roleiden in user._roles:
+                self.usersbyrole[roleiden].add(user.iden)
 
         authgates = await self.node.open(('authgates',))
         for _, node in authgates:
@@ -233,6 +304,9 @@ class Auth(s_nexus.Pusher):
         self.usersbyiden[user.iden] = user
         self.usersbyname[user.name] = user
 
+        for roleiden in user._roles:
+            self.usersbyrole[roleiden].add(user.iden)
+
         return user
 
     @s_nexus.Pusher.onPushAuto('user:name')
@@ -252,6 +326,7 @@ class Auth(s_nexus.Pusher):
         self.usersbyname[name] = user
 
         user.name = name
+        user._packed = None
         await user.node.set(name)
 
         beheld = {
@@ -281,6 +356,7 @@ class Auth(s_nexus.Pusher):
         self.rolesbyname[name] = role
 
         role.name = name
+        role._packed = None
         await role.node.set(name)
 
         beheld = {
@@ -313,8 +389,24 @@ class Auth(s_nexus.Pusher):
         if gateiden is not None:
             info = await user.genGateInfo(gateiden)
 
+        if name == 'roles' and gateiden is None:
+            for roleiden in user._roles:
+                self.usersbyrole[roleiden].discard(iden)
+            for roleiden in valu:
+                self.usersbyrole[roleiden].add(iden)
+
         await info.set(name, valu)
 
+        if gateiden is None:
+            if name == 'admin':
+                user._admin = valu
+            elif name == 'locked':
+                user._locked = valu
+            elif name == 'rules':
+                user._rules = valu
+            elif name == 'roles':
+                user._roles = valu
+
         if mesg is None:
             mesg = {
                 'iden': iden,
@@ -338,6 +430,9 @@ class Auth(s_nexus.Pusher):
 
         await info.set(name, valu)
 
+        if gateiden is None and name == 'rules':
+            role._rules = valu
+
         if mesg is None:
             mesg = {
                 'iden': iden,
@@ -520,6 +615,9 @@ class Auth(s_nexus.Pusher):
         self.usersbyiden.pop(user.iden)
         self.usersbyname.pop(user.name)
 
+        for roleiden in user._roles:
+            self.usersbyrole[roleiden].discard(user.iden)
+
         path = self.node.full + ('users', user.iden)
 
         for gate in self.authgates.values():
@@ -530,8 +628,9 @@ class Auth(s_nexus.Pusher):
         await self.feedBeholder('user:del', {'iden': iden})
 
     def _getUsersInRole(self, role):
-        for user in self.users():
-            if role.iden in user.info.get('roles', ()):
+        for useriden in list(self.usersbyrole.get(role.iden, ())):
+            user = self.user(useriden)
+            if user is not None:
                 yield user
 
     async def delRole(self, iden):
@@ -557,6 +656,7 @@ class Auth(s_nexus.Pusher):
 
         self.rolesbyiden.pop(role.iden)
         self.rolesbyname.pop(role.name)
+        self.usersbyrole.pop(role.iden, None)
 
         await role.fini()
 
@@ -581,29 +681,37 @@ class AuthGate(s_base.Base):
         self.gateroles = {}  # iden -> HiveRole
         self.gateusers = {}  # iden -> HiveUser
 
-        for useriden, usernode in await node.open(('users',)):
+        usernodes = await node.open(('users',))
+        userinfos = await asyncio.gather(*[usernode.dict() for _, usernode in usernodes])
+
+        for (useriden, _), userinfo in zip(usernodes, userinfos):
 
             user = self.auth.user(useriden)
             if user is None:  # pragma: no cover
                 logger.warning(f'Hive: path {useriden} refers to unknown user')
                 continue
 
-            userinfo = await usernode.dict()
             self.gateusers[user.iden] = user
             user.authgates[self.iden] = userinfo
             user.clearAuthCache()
 
-        for roleiden, rolenode in await node.open(('roles',)):
+        rolenodes = await node.open(('roles',))
+        roleinfos = await asyncio.gather(*[rolenode.dict() for _, rolenode in rolenodes])
+
+        for (roleiden, _), roleinfo in zip(rolenodes, roleinfos):
 
             role = self.auth.role(roleiden)
             if role is None:  # pragma: no cover
                 logger.warning(f'Hive: path {roleiden} refers to unknown role')
                 continue
 
-            roleinfo = await rolenode.dict()
             self.gateroles[role.iden] = role
             role.authgates[self.iden] = roleinfo
 
+            # only reset role local state; clearAuthCache() would visit every member
+            role._packed = None
+            role._rulemaps.pop(self.iden, None)
+
     async def genUserInfo(self, iden):
         node = await self.node.open(('users', iden))
         userinfo = await node.dict()
@@ -699,15 +807,38 @@ class HiveRuler(s_base.Base):
         self.info.setdefault('admin', False)
         self.info.setdefault('rules', ())
 
+        # mirrored by setUserInfo/setRoleInfo to avoid info lookups on hot paths
+        self._rules = self.info.get('rules')
+
         self.authgates = {}
 
+        self._packed = None
+        self._rulemaps = {}
+
     async def _setRulrInfo(self, name, valu, gateiden=None, nexs=True, mesg=None):  # pragma: no cover
         raise s_exc.NoSuchImpl(mesg='Subclass must implement _setRulrInfo')
 
+    def getRuleMaps(self, gateiden=None):
+        '''
+        Return the RuleMaps for the global or authgate rules (or None if there is no authgate info).
+        '''
+        rulemaps = self._rulemaps.get(gateiden)
+        if rulemaps is not None:
+            return rulemaps
+
+        info = self.info
+        if gateiden is not None:
+            info = self.authgates.get(gateiden)
+            if info is None:
+                return None
+
+        rulemaps = self._rulemaps[gateiden] = RuleMaps(info.get('rules', ()))
+        return rulemaps
+
     def getRules(self, gateiden=None):
 
         if gateiden is None:
-            return list(self.info.get('rules', ()))
+            return list(self._rules)
 
         gateinfo = self.authgates.get(gateiden)
         if gateinfo is None:
@@ -715,13 +846,28 @@ class HiveRuler(s_base.Base):
 
         return list(gateinfo.get('rules', ()))
 
+    def _getRulesTuple(self, gateiden=None):
+
+        if gateiden is None:
+            return tuple(self._rules)
+
+        info = self.authgates.get(gateiden)
+        if info is None:
+            return ()
+
+        return tuple(info.get('rules', ()))
+
     async def setRules(self, rules, gateiden=None, nexs=True, mesg=None):
         reqValidRules(rules)
+        rules = tuple((allow, _internperm(path)) for (allow, path) in rules)
         return await self._setRulrInfo('rules', rules, gateiden=gateiden, nexs=nexs, mesg=mesg)
 
     async def addRule(self, rule, indx=None, gateiden=None, nexs=True):
         reqValidRules((rule,))
-        rules = self.getRules(gateiden=gateiden)
+
+        # existing rules were validated when they were set
+        rules = self._getRulesTuple(gateiden=gateiden)
+        newrule = (rule[0], _internperm(rule[1]))
 
         mesg = {
             'name': 'rule:add',
@@ -729,16 +875,16 @@ class HiveRuler(s_base.Base):
             'valu': rule,
         }
         if indx is None:
-            rules.append(rule)
+            rules = rules + (newrule,)
         else:
-            rules.insert(indx, rule)
+            rules = rules[:indx] + (newrule,) + rules[indx:]
             mesg['indx'] = indx
 
-        await self.setRules(rules, gateiden=gateiden, nexs=nexs, mesg=mesg)
+        await self._setRulrInfo('rules', rules, gateiden=gateiden, nexs=nexs, mesg=mesg)
 
     async def delRule(self, rule, gateiden=None):
         reqValidRules((rule,))
-        rules = self.getRules(gateiden=gateiden)
+        rules = self._getRulesTuple(gateiden=gateiden)
         if rule not in rules:
             return False
 
@@ -747,8 +893,9 @@ class HiveRuler(s_base.Base):
             'iden': self.iden,
             'valu': rule,
         }
-        rules.remove(rule)
-        await self.setRules(rules, gateiden=gateiden, mesg=mesg)
+        indx = rules.index(rule)
+        rules = rules[:indx] + rules[indx + 1:]
+        await self._setRulrInfo('rules', rules, gateiden=gateiden, mesg=mesg)
         return True
 
 class HiveRole(HiveRuler):
@@ -759,13 +906,17 @@ class HiveRole(HiveRuler):
     set of rules can be applied to multiple users.
     '''
     def pack(self):
-        return {
-            'type': 'role',
-            'iden': self.iden,
-            'name': self.name,
-            'rules': self.info.get('rules'),
-            'authgates': {name: info.pack() for (name, info) in self.authgates.items()},
-        }
+
+        if self._packed is None:
+            self._packed = {
+                'type': 'role',
+                'iden': self.iden,
+                'name': self.name,
+                'rules': self.info.get('rules'),
+                'authgates': {name: info.pack() for (name, info) in self.authgates.items()},
+            }
+
+        return self._packed.copy()
 
     async def _setRulrInfo(self, name, valu, gateiden=None, nexs=True, mesg=None):
         if nexs:
@@ -777,9 +928,10 @@ class HiveRole(HiveRuler):
         return await self.auth.setRoleName(self.iden, name)
 
     def clearAuthCache(self):
-        for user in self.auth.users():
-            if user.hasRole(self.iden):
-                user.clearAuthCache()
+        self._packed = None
+        self._rulemaps.clear()
+        for user in self.auth._getUsersInRole(self):
+            user.clearAuthCache()
 
     async def genGateInfo(self, gateiden):
         info = self.authgates.get(gateiden)
@@ -790,21 +942,15 @@ class HiveRole(HiveRuler):
 
     def allowed(self, perm, default=None, gateiden=None):
 
-        perm = tuple(perm)
-        if gateiden is not None:
-            info = self.authgates.get(gateiden)
-            if info is not None:
-                for allow, path in info.get('rules', ()):
-                    if perm[:len(path)] == path:
-                        return allow
+        rulemaps = self.getRuleMaps(gateiden=gateiden)
+        if rulemaps is None:
             return default
 
-        # 2. check user rules
-        for allow, path in self.info.get('rules', ()):
-            if perm[:len(path)] == path:
-                return allow
+        allow = rulemaps.get(tuple(perm))
+        if allow is None:
+            return default
 
-        return default
+        return allow
 
 class HiveUser(HiveRuler):
     '''
@@ -829,26 +975,41 @@ class HiveUser(HiveRuler):
         varz = await self.node.open(('vars',))
         self.vars = await varz.dict(nexs=True)
 
+        self._admin = self.info.get('admin')
+        self._locked = self.info.get('locked')
+        self._roles = self.info.get('roles')
+
+        self._roleobjs = None
+        self._flatrules = {}
+
+        self._passwdok = None
+        self._passwdkey = os.urandom(32)
+        self._flatmaps = {}
+
         self.permcache = s_cache.FixedCache(self._allowed)
 
     def pack(self, packroles=False):
 
-        roles = self.info.get('roles', ())
+        if self._packed is None:
+            self._packed = {
+                'type': 'user',
+                'iden': self.iden,
+                'name': self.name,
+                'rules': self.info.get('rules', ()),
+                'roles': self.info.get('roles', ()),
+                'admin': self.info.get('admin', ()),
+                'email': self.info.get('email'),
+                'locked': self.info.get('locked'),
+                'archived': self.info.get('archived'),
+                'authgates': {name: info.pack() for (name, info) in self.authgates.items()},
+            }
+
+        # callers may modify the top level of the returned dict
+        info = self._packed.copy()
         if packroles:
-            roles = [self.auth.role(r).pack() for r in roles]
+            info['roles'] = [self.auth.role(r).pack() for r in info['roles']]
 
-        return {
-            'type': 'user',
-            'iden': self.iden,
-            'name': self.name,
-            'rules': self.info.get('rules', ()),
-            'roles': roles,
-            'admin': self.info.get('admin', ()),
-            'email': self.info.get('email'),
-            'locked': self.info.get('locked'),
-            'archived': self.info.get('archived'),
-            'authgates': {name: info.pack() for (name, info) in self.authgates.items()},
-        }
+        return info
 
     async def _setRulrInfo(self, name, valu, gateiden=None, nexs=True, mesg=None):
         if nexs:
@@ -864,57 +1025,130 @@ class HiveUser(HiveRuler):
             await self.addRule((True, perm), indx=0)
 
     def allowed(self, perm, default=None, gateiden=None):
+
+        if self._locked:
+            return False
+
+        if self._admin:
+            return True
+
         perm = tuple(perm)
         return self.permcache.get((perm, default, gateiden))
 
-    def _allowed(self, pkey):
+    def allowedMany(self, perms, default=None, gateiden=None):
+        '''
+        Check a list of permissions for the user.
 
-        perm, default, gateiden = pkey
+        Args:
+            perms (list): A list of permission tuples.
+            default: The value to return for a permission with no matching rule.
+            gateiden (str): An optional AuthGate iden.
 
-        if self.info.get('locked'):
-            return False
+        Returns:
+            list: The allowed result for each permission, in order.
+        '''
+        perms = [tuple(perm) for perm in perms]
 
-        if self.info.get('admin'):
-            return True
+        if self._locked:
+            return [False for perm in perms]
 
-        # 1. check authgate user rules
-        if gateiden is not None:
+        if self._admin:
+            return [True for perm in perms]
 
-            info = self.authgates.get(gateiden)
-            if info is not None:
+        rulemaps = self._getPermMaps(gateiden)
+        if rulemaps is None:
+            return [True for perm in perms]
 
-                if info.get('admin'):
-                    return True
+        retn = []
+        for perm in perms:
+            allow = rulemaps.get(perm)
+            if allow is None:
+                allow = default
+            retn.append(allow)
 
-                for allow, path in info.get('rules', ()):
-                    if perm[:len(path)] == path:
-                        return allow
+        return retn
 
-        # 2. check user rules
-        for allow, path in self.info.get('rules', ()):
-            if perm[:len(path)] == path:
-                return allow
+    def getFlatRules(self, gateiden=None):
+        '''
+        Return the effective rules for the user on the given gate as a single ordered tuple.
 
-        # 3. check authgate role rules
+        The rules are flattened in precedence order: authgate user rules, user rules,
+        authgate role rules, and then role rules.
+        '''
+        rules = self._flatrules.get(gateiden)
+        if rules is not None:
+            return rules
+
+        roles = self.getRoles()
+
+        if gateiden is None:
+            rules = list(self._rules)
+            for role in roles:
+                rules.extend(role._rules)
+
+            rules = self._flatrules[None] = tuple(rules)
+            return rules
+
+        userinfo = self.authgates.get(gateiden)
+        roleinfos = [info for info in (r.authgates.get(gateiden) for r in roles) if info is not None]
+
+        # gates with no user or role specific info share the global rules
+        if userinfo is None and not roleinfos:
+            return self.getFlatRules()
+
+        rules = []
+        if userinfo is not None:
+            rules.extend(userinfo.get('rules', ()))
+
+        rules.extend(self._rules)
+
+        for info in roleinfos:
+            rules.extend(info.get('rules', ()))
+
+        for role in roles:
+            rules.extend(role._rules)
+
+        rules = self._flatrules[gateiden] = tuple(rules)
+        return rules
+
+    def getFlatMaps(self, gateiden=None):
+        '''
+        Return a RuleMaps for the flattened rules of the user on the given gate.
+        '''
+        rulemaps = self._flatmaps.get(gateiden)
+        if rulemaps is not None:
+            return rulemaps
+
+        rules = self.getFlatRules(gateiden=gateiden)
+        if gateiden is not None and rules is self.getFlatRules():
+            return self.getFlatMaps()
+
+        rulemaps = self._flatmaps[gateiden] = RuleMaps(rules)
+        return rulemaps
+
+    def _getPermMaps(self, gateiden):
+        # returns None if the user is an admin of the authgate
         if gateiden is not None:
+            info = self.authgates.get(gateiden)
+            if info is not None and info.get('admin'):
+                return None
 
-            for role in self.getRoles():
+        return self.getFlatMaps(gateiden)
 
-                info = role.authgates.get(gateiden)
-                if info is None:
-                    continue
+    def _allowed(self, pkey):
 
-                for allow, path in info.get('rules', ()):
-                    if perm[:len(path)] == path:
-                        return allow
+        perm, default, gateiden = pkey
 
-        # 4. check role rules
-        for role in self.getRoles():
-            for allow, path in role.info.get('rules', ()):
-                if perm[:len(path)] == path:
-                    return allow
+        # locked and admin users are handled by allowed() before the permcache
+        rulemaps = self._getPermMaps(gateiden)
+        if rulemaps is None:
+            return True
 
-        return default
+        allow = rulemaps.get(perm)
+        if allow is None:
+            return default
+
+        return allow
 
     def getAllowedReason(self, perm, gateiden=None, default=False):
         '''
@@ -929,6 +1163,8 @@ class HiveUser(HiveRuler):
         if self.info.get('admin'):
             return (True, 'The user is a global admin.')
 
+        permlen = len(perm)
+
         # 1. check authgate user rules
         if gateiden is not None:
 
@@ -939,12 +1175,12 @@ class HiveUser(HiveRuler):
                     return (True, f'The user is an admin of auth gate {gateiden}.')
 
                 for allow, path in info.get('rules', ()):
-                    if perm[:len(path)] == path:
+                    if len(path) <= permlen and perm[:len(path)] == path:
                         return (allow, f'Matched user rule ({textFromRule((allow, path))}) on gate {gateiden}.')
 
         # 2. check user rules
         for allow, path in self.info.get('rules', ()):
-            if perm[:len(path)] == path:
+            if len(path) <= permlen and perm[:len(path)] == path:
                 return (allow, f'Matched user rule ({textFromRule((allow, path))}).')
 
         # 3. check authgate role rules
@@ -957,18 +1193,24 @@ class HiveUser(HiveRuler):
                     continue
 
                 for allow, path in info.get('rules', ()):
-                    if perm[:len(path)] == path:
+                    if len(path) <= permlen and perm[:len(path)] == path:
                         return (allow, f'Matched role rule ({textFromRule((allow, path))}) for role {role.name} on gate {gateiden}.')
 
         # 4. check role rules
         for role in self.getRoles():
             for allow, path in role.info.get('rules', ()):
-                if perm[:len(path)] == path:
+                if len(path) <= permlen and perm[:len(path)] == path:
                     return (allow, f'Matched role rule ({textFromRule((allow, path))}) for role {role.name}.')
 
         return (default, 'No matching rule found.')
 
     def clearAuthCache(self):
+        self._packed = None
+        self._passwdok = None
+        self._roleobjs = None
+        self._rulemaps.clear()
+        self._flatrules.clear()
+        self._flatmaps.clear()
         self.permcache.clear()
 
     async def genGateInfo(self, gateiden):
@@ -994,28 +1236,38 @@ class HiveUser(HiveRuler):
         raise s_exc.AuthDeny(mesg=mesg, perm=perm, user=self.iden, username=self.name)
 
     def getRoles(self):
-        for iden in self.info.get('roles', ()):
+        '''
+        Return a tuple of the HiveRole objects granted to the user.
+        '''
+        if self._roleobjs is not None:
+            return self._roleobjs
+
+        roles = []
+        for iden in self._roles:
             role = self.auth.role(iden)
             if role is None:
-                logger.warning('user {self.iden} has non-existent role: {iden}')
+                logger.warning(f'user {self.iden} has non-existent role: {iden}')
                 continue
-            yield role
+            roles.append(role)
+
+        self._roleobjs = tuple(roles)
+        return self._roleobjs
 
     def hasRole(self, iden):
-        return iden in self.info.get('roles', ())
+        return iden in self._roles
 
     async def grant(self, roleiden, indx=None):
 
         role = await self.auth.reqRole(roleiden)
 
-        roles = list(self.info.get('roles'))
+        roles = tuple(self._roles)
         if role.iden in roles:
             return
 
         if indx is None:
-            roles.append(role.iden)
+            roles = roles + (role.iden,)
         else:
-            roles.insert(indx, role.iden)
+            roles = roles[:indx] + (role.iden,) + roles[indx:]
 
         mesg = {'name': 'role:grant', 'iden': self.iden, 'role': role.pack()}
         await self.auth.setUserInfo(self.iden, 'roles', roles, mesg=mesg)
@@ -1034,7 +1286,7 @@ class HiveUser(HiveRuler):
         Returns:
             None
         '''
-        current_roles = list(self.info.get('roles'))
+        current_roles = list(self._roles)
 
         roleidens = list(roleidens)
 
@@ -1061,11 +1313,12 @@ class HiveUser(HiveRuler):
             mesg = 'Role "all" may not be revoked.'
             raise s_exc.BadArg(mesg=mesg)
 
-        roles = list(self.info.get('roles'))
+        roles = tuple(self._roles)
         if role.iden not in roles:
             return
 
-        roles.remove(role.iden)
+        indx = roles.index(role.iden)
+        roles = roles[:indx] + roles[indx + 1:]
         mesg = {'name': 'role:revoke', 'iden': self.iden, 'role': role.pack()}
         if nexs:
             await self.auth.setUserInfo(self.iden, 'roles', roles, mesg=mesg)
@@ -1146,7 +1399,19 @@ class HiveUser(HiveRuler):
             return False
 
         if isinstance(shadow, dict):
-            return await s_passwd.checkShadowV2(passwd=passwd, shadow=shadow)
+
+            passhash = hashlib.blake2b(passwd.encode(), key=self._passwdkey).digest()
+
+            if self._passwdok is not None:
+                okhash, oktime = self._passwdok
+                if time.monotonic() - oktime < PASSWD_CACHE_TIME and hmac.compare_digest(okhash, passhash):
+                    return True
+
+            if not await s_passwd.checkShadowV2(passwd=passwd, shadow=shadow):
+                return False
+
+            self._passwdok = (passhash, time.monotonic())
+            return True
 
         # Backwards compatible password handling
         salt, hashed = shadow
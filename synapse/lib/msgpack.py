@@ -129,6 +129,7 @@ def iterfile(path, since=-1):
 
     Args:
         path: File path to open and consume data from.
+        since (int): Skip objects up to and including this index.
 
     Notes:
         String objects are decoded using utf8 encoding.  In order to handle
@@ -142,11 +143,14 @@ def iterfile(path, since=-1):
 
         unpk = msgpack.Unpacker(fd, **unpacker_kwargs)
 
-        for i, mesg in enumerate(unpk):
-            if i <= since:
-                continue
+        # skip objects up to and including since without decoding them
+        for _ in range(since + 1):
+            try:
+                unpk.skip()
+            except msgpack.OutOfData:
+                return
 
-            yield mesg
+        yield from unpk
 
 class Unpk:
     '''
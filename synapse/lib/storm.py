@@ -1787,6 +1787,7 @@ class Runtime(s_base.Base):
         self.runtvars.update({k: True for k in self.ctors.keys()})
 
         self.proxies = {}
+        self.httpconns = {}
 
         self._loadRuntVars(query)
         self.onfini(self._onRuntFini)
@@ -71,9 +71,9 @@ class WebSocket(s_base.Base, s_stormtypes.StormType):
         try:
             _type, data, extra = await asyncio.wait_for(self.resp.receive(), timeout=timeout)
             if _type == aiohttp.WSMsgType.BINARY:
-                return (True, json.loads(data))
+                return (True, s_common.jsonloads(data))
             if _type == aiohttp.WSMsgType.TEXT:
-                return (True, json.loads(data.encode()))
+                return (True, s_common.jsonloads(data))
             if _type == aiohttp.WSMsgType.CLOSED:  # pragma: no cover
                 return (True, None)
             return (False, ('BadMesgFormat', {'mesg': f'WebSocket RX unhandled type: {_type.name}'}))  # pragma: no cover
@@ -344,6 +344,28 @@ class LibHttp(s_stormtypes.Lib):
             await sock.fini()
             return s_common.retnexc(e)
 
+    async def _getHttpConnector(self, proxy):
+        '''
+        Get a connector for the given proxy which is shared for the lifetime of the runtime.
+        '''
+        connector = self.runt.httpconns.get(proxy)
+        if connector is not None and not connector.closed:
+            return connector
+
+        if proxy:
+            connector = aiohttp_socks.ProxyConnector.from_url(proxy)
+        else:
+            # cache DNS across requests and cap the open connections per runtime
+            connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, enable_cleanup_closed=True)
+
+        async def fini():
+            await connector.close()
+
+        self.runt.httpconns[proxy] = connector
+        self.runt.onfini(fini)
+
+        return connector
+
     def _buildFormData(self, fields):
         data = aiohttp.FormData()
         for field in fields:
@@ -395,10 +417,6 @@ class LibHttp(s_stormtypes.Lib):
         if proxy is None:
             proxy = await self.runt.snap.core.getConfOpt('http:proxy')
 
-        connector = None
-        if proxy:
-            connector = aiohttp_socks.ProxyConnector.from_url(proxy)
-
         if ssl_verify is False:
             kwargs['ssl'] = False
         elif cadir:
@@ -407,14 +425,16 @@ class LibHttp(s_stormtypes.Lib):
             # default aiohttp behavior
             kwargs['ssl'] = None
 
-        timeout = aiohttp.ClientTimeout(total=timeout)
+        kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
 
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as sess:
-            try:
-                if fields:
-                    data = self._buildFormData(fields)
-                else:
-                    data = body
+        # each request gets its own session (and cookie jar) but connections are pooled
+        connector = await self._getHttpConnector(proxy)
+        try:
+            if fields:
+                data = self._buildFormData(fields)
+            else:
+                data = body
+            async with aiohttp.ClientSession(connector=connector, connector_owner=False) as sess:
                 async with sess.request(meth, url, headers=headers, json=json, data=data, **kwargs) as resp:
                     info = {
                         'code': resp.status,
@@ -425,20 +445,20 @@ class LibHttp(s_stormtypes.Lib):
                     }
                     return HttpResp(info)
 
-            except asyncio.CancelledError:  # pragma: no cover
-                raise
-            except Exception as e:
-                logger.exception(f'Error during http {meth} @ {url}')
-                err = s_common.err(e)
-                info = {
-                    'code': -1,
-                    'reason': 'Exception occurred during request',
-                    'headers': dict(),
-                    'url': url,
-                    'body': b'',
-                    'err': err,
-                }
-                return HttpResp(info)
+        except asyncio.CancelledError:  # pragma: no cover
+            raise
+        except Exception as e:
+            logger.exception(f'Error during http {meth} @ {url}')
+            err = s_common.err(e)
+            info = {
+                'code': -1,
+                'reason': 'Exception occurred during request',
+                'headers': dict(),
+                'url': url,
+                'body': b'',
+                'err': err,
+            }
+            return HttpResp(info)
 
 @s_stormtypes.registry.registerType
 class HttpResp(s_stormtypes.Prim):
@@ -470,12 +490,15 @@ class HttpResp(s_stormtypes.Prim):
     _storm_typename = 'inet:http:resp'
     def __init__(self, valu, path=None):
         super().__init__(valu, path=path)
-        self.locls.update(self.getObjLocals())
-        self.locls['code'] = self.valu.get('code')
-        self.locls['reason'] = self.valu.get('reason')
-        self.locls['body'] = self.valu.get('body')
-        self.locls['headers'] = self.valu.get('headers')
-        self.locls['err'] = self.valu.get('err', ())
+        # build the locals in one pass; responses are created for every request
+        self.locls = {
+            **self.getObjLocals(),
+            'code': valu.get('code'),
+            'reason': valu.get('reason'),
+            'body': valu.get('body'),
+            'headers': valu.get('headers'),
+            'err': valu.get('err', ()),
+        }
 
     def getObjLocals(self):
         return {
@@ -493,7 +516,7 @@ class HttpResp(s_stormtypes.Prim):
             else:
                 encoding = await s_stormtypes.tostr(encoding)
 
-            return json.loads(valu.decode(encoding, errors))
+            return s_common.jsonloads(valu.decode(encoding, errors))
 
         except UnicodeDecodeError as e:
             raise s_exc.StormRuntimeError(mesg=f'{e}: {repr(valu)[:256]}') from None
@@ -4,7 +4,10 @@ Provides data for the ISO 3166-1 Country codes.
 Reference:
     https://en.wikipedia.org/wiki/ISO_3166
 """
-countries = [
+import sys
+
+# the raw rows load as a single constant; see __getattr__ for the public names
+_countries = (
     ("afghanistan", "af", "afg", "004"),
     ("aland islands", "ax", "ala", "248"),
     ("albania", "al", "alb", "008"),
@@ -241,7 +244,6 @@ countries = [
     ("united kingdom", "gb", "gbr", "826"),
     ("united states of america", "us", "usa", "840"),
     ("us minor outlying islands", "um", "umi", "581"),
-    ("us minor islands", "um", "umi", "581"),
     ("uruguay", "uy", "ury", "858"),
     ("uzbekistan", "uz", "uzb", "860"),
     ("vanuatu", "vu", "vut", "548"),
@@ -253,12 +255,81 @@ countries = [
     ("yemen", "ye", "yem", "887"),
     ("zambia", "zm", "zmb", "894"),
     ("zimbabwe", "zw", "zwe", "716"),
-]
+)
+
+# alternate country names mapped to their alpha2 code
+_synonyms = (
+    ("us minor islands", "um"),
+)
+
+def _initLookups():
+
+    countries = []
+
+    name2alpha2 = {}
+    name2alpha3 = {}
+    name2num = {}
+    alpha2name = {}
+    alpha3name = {}
+    num2alpha2 = {}
+
+    for row in _countries:
+
+        # intern the static names and codes so lookups against them can compare by identity
+        row = tuple(sys.intern(valu) for valu in row)
+        countries.append(row)
+
+        name, alpha2, alpha3, num = row
+
+        name2alpha2[name] = alpha2
+        name2alpha3[name] = alpha3
+        name2num[name] = num
+        num2alpha2[num] = alpha2
+
+        alpha2name[alpha2] = name
+        alpha3name[alpha3] = name
+
+    synonyms = {sys.intern(name): sys.intern(alpha2) for (name, alpha2) in _synonyms}
+
+    return {
+        'countries': tuple(countries),
+        'name2alpha2': name2alpha2,
+        'name2alpha3': name2alpha3,
+        'name2num': name2num,
+        'alpha2name': alpha2name,
+        'alpha3name': alpha3name,
+        'num2alpha2': num2alpha2,
+        'synonyms': synonyms,
+        # country2iso also accepts synonyms
+        'country2iso': {**name2alpha2, **synonyms},
+    }
+
+def _getLookups():
+    glob = globals()
+    if 'countries' not in glob:
+        glob.update(_initLookups())
+    return glob
+
+def normCountries(names, default=None):
+    '''
+    Get the ISO 3166 alpha2 code for each country name (or synonym) in a sequence.
+
+    Args:
+        names (list): A list of country names.
+        default: The value to return for unknown country names.
+
+    Returns:
+        list: The alpha2 code (or default) for each name, in order.
+    '''
+    get = _getLookups()['country2iso'].get
+    return [get(name, default) for name in names]
 
-def makeColLook(rows, scol, dcol):
-    retn = {}
-    for x in rows:
-        retn[x[scol]] = x[dcol]
-    return retn
+def __getattr__(name):
+    # build the lookups on first use and store them as module globals
+    glob = globals()
+    if not name.startswith('_') and 'countries' not in glob:
+        _getLookups()
+        if name in glob:
+            return glob[name]
 
-country2iso = makeColLook(countries, 0, 1)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,4 +1,5 @@
 import os
+import json
 import logging
 import subprocess
 
@@ -383,6 +384,21 @@ class CommonTest(s_t_utils.SynTest):
         retn = s_common.merggenr2([asyncl(lt) for lt in (l3, l2, l1)], reverse=True)
         self.eq((9, 8, 7, 6, 5, 4, 3, 2, 1), await alist(retn))
 
+    def test_common_jsonloads(self):
+
+        self.eq({'foo': [1, 'bar']}, s_common.jsonloads(b'{"foo": [1, "bar"]}'))
+        self.eq({'foo': [1, 'bar']}, s_common.jsonloads('{"foo": [1, "bar"]}'))
+
+        # integers beyond 64 bits and NaN/Infinity decode the same as the stdlib
+        self.eq([2 ** 80 + 1, -(2 ** 63) - 1], s_common.jsonloads(b'[1208925819614629174706177, -9223372036854775809]'))
+        self.eq([2 ** 64 - 1], s_common.jsonloads('[18446744073709551615]'))
+        self.eq('[nan, inf]', str(s_common.jsonloads(b'[NaN, Infinity]')))
+        self.eq({'foo': 'bar'}, s_common.jsonloads('{"foo": "bar"}'.encode('utf-16')))
+        self.eq('\ud800', s_common.jsonloads('"\ud800"'))
+
+        with self.raises(json.JSONDecodeError):
+            s_common.jsonloads(b'newp')
+
     def test_jsonsafe(self):
         items = (
             (None, None),
@@ -1,8 +1,14 @@
 import pathlib
 
+from unittest import mock
+
 import synapse.exc as s_exc
 import synapse.telepath as s_telepath
 
+import synapse.lib.hiveauth as s_hiveauth
+
+import synapse.lib.crypto.passwd as s_passwd
+
 import synapse.tests.utils as s_test
 from synapse.tests.utils import alist
 
@@ -39,6 +45,10 @@ class AuthTest(s_test.SynTest):
             self.true(user.info.get('admin'))
             self.true(user.allowed(('foo', 'bar')))
 
+            # admin checks do not go through the permcache
+            self.len(0, user.permcache)
+            await user.setAdmin(False)
+
             await user.addRule((True, ('foo',)))
             self.true(user.allowed(('foo', 'bar')))
             self.len(1, user.permcache)
@@ -49,7 +59,7 @@ class AuthTest(s_test.SynTest):
             await user.addRule((True, ('foo',)))
             await user.grant(role.iden)
             self.len(0, user.permcache)
-            self.true(user.allowed(('baz', 'faz')))
+            self.none(user.allowed(('baz', 'faz')))
             self.len(1, user.permcache)
 
             await role.addRule((True, ('baz', 'faz')))
@@ -321,6 +331,11 @@ class AuthTest(s_test.SynTest):
             # Restart the core/auth and make sure perms work
 
             async with self.getTestCoreAndProxy(dirn=fdir) as (core, prox):
+
+                self.eq({fred['iden']}, core.auth.usersbyrole[friends['iden']])
+                self.nn(core.auth.role(friends['iden']))
+                self.eq('fred', core.auth.user(fred['iden']).name)
+
                 async with core.getLocalProxy(user='fred') as fredcore:
                     viewopts = {'view': view2.iden}
                     self.eq(2, await fredcore.count('test:int', opts=viewopts))
@@ -364,3 +379,209 @@ class AuthTest(s_test.SynTest):
                 await core.auth.allrole.setRules([(True, ('hehe', 'haha'), 'newp')])
             with self.raises(s_exc.SchemaViolation):
                 await core.auth.allrole.setRules([(True, )])
+
+    async def test_hive_auth_rule_order(self):
+
+        rulemaps = s_hiveauth.RuleMaps((
+            (True, ('foo',)),
+            (False, ('foo', 'bar')),
+            (False, ('baz', 'faz')),
+            (True, ('baz',)),
+            (True, ('baz', 'faz')),
+        ))
+
+        # the first matching rule wins, not the most specific one
+        self.true(rulemaps.get(('foo', 'bar', 'baz')))
+        self.false(rulemaps.get(('baz', 'faz', 'hehe')))
+        self.true(rulemaps.get(('baz', 'hehe')))
+        self.none(rulemaps.get(('hehe',)))
+        self.none(rulemaps.get(()))
+
+        # rules shadowed by an earlier prefix rule are dropped
+        self.eq(rulemaps.maps, (
+            (2, {('baz', 'faz'): False}),
+            (1, {('foo',): True, ('baz',): True}),
+        ))
+
+        self.false(s_hiveauth.RuleMaps(((False, ()), (True, ('foo',)))).get(('foo',)))
+
+        async with self.getTestCore() as core:
+
+            user = await core.auth.addUser('visi')
+            role = await core.auth.addRole('ninjas')
+            await user.grant(role.iden)
+
+            await user.addRule((True, ('foo', 'bar')))
+            await user.addRule((False, ('foo',)))
+
+            self.true(user.allowed(('foo', 'bar', 'baz')))
+            self.false(user.allowed(('foo', 'baz')))
+            self.none(user.allowed(('hehe', 'haha')))
+
+            await role.addRule((False, ('hehe', 'haha')))
+            await role.addRule((True, ('hehe',)))
+
+            self.false(user.allowed(('hehe', 'haha')))
+            self.true(user.allowed(('hehe', 'hoho')))
+            self.false(role.allowed(('hehe', 'haha')))
+            self.true(role.allowed(('hehe', 'hoho')))
+
+            # rule updates on the role are reflected in the user
+            await role.addRule((True, ('hehe', 'haha')), indx=0)
+            self.true(user.allowed(('hehe', 'haha')))
+            self.true(role.allowed(('hehe', 'haha')))
+
+            gateiden = core.view.iden
+            self.none(role.allowed(('hehe', 'haha'), gateiden=gateiden))
+
+            await role.addRule((False, ('hehe',)), gateiden=gateiden)
+            self.false(user.allowed(('hehe', 'haha'), gateiden=gateiden))
+            self.false(role.allowed(('hehe', 'haha'), gateiden=gateiden))
+
+            await user.addRule((True, ('hehe', 'haha')), gateiden=gateiden)
+            self.true(user.allowed(('hehe', 'haha'), gateiden=gateiden))
+            self.false(user.allowed(('hehe', 'hoho'), gateiden=gateiden))
+            self.true(user.allowed(('hehe', 'hoho')))
+
+            # rules are flattened in precedence order
+            self.eq(user.getFlatRules(gateiden=gateiden), (
+                (True, ('hehe', 'haha')),
+                (True, ('foo', 'bar')),
+                (False, ('foo',)),
+                (True, ('view', 'read')),
+                (False, ('hehe',)),
+                (True, ('hehe', 'haha')),
+                (False, ('hehe', 'haha')),
+                (True, ('hehe',)),
+            ))
+
+            # gates without user or role rules share the global rules
+            self.true(user.getFlatRules(gateiden='newp') is user.getFlatRules())
+            self.true(user.getFlatMaps(gateiden='newp') is user.getFlatMaps())
+
+    async def test_hive_auth_usersbyrole(self):
+
+        async with self.getTestCore() as core:
+
+            auth = core.auth
+
+            visi = await auth.addUser('visi')
+            newp = await auth.addUser('newp')
+            ninjas = await auth.addRole('ninjas')
+
+            self.isin(visi.iden, auth.usersbyrole[auth.allrole.iden])
+            self.isin(newp.iden, auth.usersbyrole[auth.allrole.iden])
+
+            await visi.grant(ninjas.iden)
+            await newp.grant(ninjas.iden)
+            self.eq({visi.iden, newp.iden}, auth.usersbyrole[ninjas.iden])
+
+            self.eq((auth.allrole, ninjas), newp.getRoles())
+
+            await newp.revoke(ninjas.iden)
+            self.eq({visi.iden}, auth.usersbyrole[ninjas.iden])
+            self.eq((auth.allrole,), newp.getRoles())
+
+            await newp.setRoles((auth.allrole.iden, ninjas.iden))
+            self.eq({visi.iden, newp.iden}, auth.usersbyrole[ninjas.iden])
+
+            await auth.delUser(newp.iden)
+            self.eq({visi.iden}, auth.usersbyrole[ninjas.iden])
+            self.notin(newp.iden, auth.usersbyrole[auth.allrole.iden])
+
+            await ninjas.addRule((True, ('foo',)))
+            self.true(visi.allowed(('foo',)))
+
+            await auth.delRole(ninjas.iden)
+            self.notin(ninjas.iden, auth.usersbyrole)
+            self.notin(ninjas.iden, visi.info.get('roles'))
+            self.none(visi.allowed(('foo',)))
+
+    async def test_hive_auth_pack(self):
+
+        async with self.getTestCore() as core:
+
+            visi = await core.auth.addUser('visi')
+            ninjas = await core.auth.addRole('ninjas')
+
+            udef = visi.pack()
+            udef['roles'] = 'newp'
+            self.eq(visi.pack()['roles'], (core.auth.allrole.iden,))
+
+            await visi.grant(ninjas.iden)
+            await visi.setName('visi2')
+            await visi.addRule((True, ('foo',)), gateiden=core.view.iden)
+
+            udef = visi.pack()
+            self.eq(udef['name'], 'visi2')
+            self.eq(udef['roles'], (core.auth.allrole.iden, ninjas.iden))
+            self.eq(udef['authgates'][core.view.iden]['rules'], ((True, ('foo',)),))
+
+            udef = visi.pack(packroles=True)
+            self.eq(udef['roles'][1]['name'], 'ninjas')
+            self.eq(visi.pack()['roles'], (core.auth.allrole.iden, ninjas.iden))
+
+            await ninjas.setName('ninjas2')
+            await ninjas.addRule((True, ('bar',)))
+            await ninjas.addRule((True, ('baz',)), gateiden=core.view.iden)
+
+            rdef = ninjas.pack()
+            self.eq(rdef['name'], 'ninjas2')
+            self.eq(rdef['rules'], ((True, ('bar',)),))
+            self.eq(rdef['authgates'][core.view.iden]['rules'], ((True, ('baz',)),))
+            self.eq(visi.pack(packroles=True)['roles'][1]['name'], 'ninjas2')
+
+    async def test_hive_auth_passwd_cache(self):
+
+        async with self.getTestCore() as core:
+
+            visi = await core.auth.addUser('visi', passwd='secret')
+
+            with mock.patch('synapse.lib.crypto.passwd.checkShadowV2', wraps=s_passwd.checkShadowV2) as check:
+
+                self.true(await visi.tryPasswd('secret'))
+                self.true(await visi.tryPasswd('secret'))
+                self.eq(1, check.call_count)
+
+                # failures are never cached
+                self.false(await visi.tryPasswd('newp'))
+                self.false(await visi.tryPasswd('newp'))
+                self.eq(3, check.call_count)
+
+                with mock.patch('synapse.lib.hiveauth.PASSWD_CACHE_TIME', 0):
+                    self.true(await visi.tryPasswd('secret'))
+                    self.eq(4, check.call_count)
+
+                await visi.setPasswd('hehe')
+                self.false(await visi.tryPasswd('secret'))
+                self.true(await visi.tryPasswd('hehe'))
+
+                await visi.setLocked(True)
+                self.false(await visi.tryPasswd('hehe'))
+
+    async def test_hive_auth_allowed_many(self):
+
+        async with self.getTestCore() as core:
+
+            visi = await core.auth.addUser('visi')
+            await visi.addRule((True, ('foo',)))
+            await visi.addRule((False, ('bar',)))
+            await visi.addRule((True, ('baz',)), gateiden=core.view.iden)
+
+            perms = (('foo', 'hehe'), ('bar',), ['baz'], ('newp',))
+            self.eq([True, False, None, None], visi.allowedMany(perms))
+            self.eq([True, False, 'yolo', 'yolo'], visi.allowedMany(perms, default='yolo'))
+            self.eq([True, False, True, None], visi.allowedMany(perms, gateiden=core.view.iden))
+            self.eq([visi.allowed(p, gateiden=core.view.iden) for p in perms],
+                    visi.allowedMany(perms, gateiden=core.view.iden))
+            self.eq([], visi.allowedMany(()))
+
+            await visi.setAdmin(True, gateiden=core.view.iden)
+            self.eq([True, True, True, True], visi.allowedMany(perms, gateiden=core.view.iden))
+            self.eq([True, False, None, None], visi.allowedMany(perms))
+
+            await visi.setAdmin(True)
+            self.eq([True, True, True, True], visi.allowedMany(perms))
+
+            await visi.setLocked(True)
+            self.eq([False, False, False, False], visi.allowedMany(perms))
@@ -54,6 +54,12 @@ class MsgPackTest(s_t_utils.SynTest):
             self.len(2, items)
             self.sorteq(items, [t0, t1])
 
+            items = list(s_msgpack.iterfile(s_common.genpath(fdir, 'test.mpk'), since=0))
+            self.eq(items, [t1])
+
+            items = list(s_msgpack.iterfile(s_common.genpath(fdir, 'test.mpk'), since=10))
+            self.eq(items, [])
+
             fd.close()
     def test_msgpack_iterfd(self):
         self.checkIterfd(s_msgpack.en)
@@ -75,6 +81,12 @@ class MsgPackTest(s_t_utils.SynTest):
             self.len(2, items)
             self.sorteq(items, [t0, t1])
 
+            items = list(s_msgpack.iterfile(s_common.genpath(fdir, 'test.mpk'), since=0))
+            self.eq(items, [t1])
+
+            items = list(s_msgpack.iterfile(s_common.genpath(fdir, 'test.mpk'), since=10))
+            self.eq(items, [])
+
             fd.close()
 
     def test_msgpack_iterfile(self):
@@ -9,3 +9,21 @@ class CountryLookTest(s_t_utils.SynTest):
         self.eq(s_l_country.country2iso.get('united states of america'), 'us')
         self.eq(s_l_country.country2iso.get('mexico'), 'mx')
         self.eq(s_l_country.country2iso.get('vertexLandia'), None)
+
+        self.eq(s_l_country.name2alpha3.get('mexico'), 'mex')
+        self.eq(s_l_country.name2num.get('mexico'), '484')
+        self.eq(s_l_country.alpha2name.get('mx'), 'mexico')
+        self.eq(s_l_country.alpha3name.get('mex'), 'mexico')
+        self.eq(s_l_country.num2alpha2.get('484'), 'mx')
+        self.eq(s_l_country.alpha2name.get('um'), 'us minor outlying islands')
+        self.none(s_l_country.alpha2name.get('newp'))
+
+        names = ('mexico', 'newp', 'united states of america')
+        self.eq(s_l_country.normCountries(names), ['mx', None, 'us'])
+        self.eq(s_l_country.normCountries(names, default=''), ['mx', '', 'us'])
+
+        self.eq(s_l_country.synonyms.get('us minor islands'), 'um')
+        self.eq(s_l_country.country2iso.get('us minor islands'), 'um')
+        self.none(s_l_country.name2alpha2.get('us minor islands'))
+        self.len(1, [row for row in s_l_country.countries if row[1] == 'um'])
+        self.eq(s_l_country.normCountries(('us minor islands',)), ['um'])
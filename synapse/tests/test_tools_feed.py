@@ -1,4 +1,5 @@
 import json
+import asyncio
 import hashlib
 
 from unittest import mock
@@ -72,11 +73,155 @@ class FeedTest(s_t_utils.SynTest):
                         jsonlfp]
 
                 outp = self.getTestOutp()
-                self.eq(await s_feed.main(argv, outp=outp), 0)
+                with mock.patch.object(s_feed, 'reportinterval', 60):
+                    self.eq(await s_feed.main(argv, outp=outp), 0)
+
+                # progress for the whole file is reported once
+                self.true(outp.expect('Added [20] items from [podes.jsonl] - offset [20]'))
+                self.false(outp.expect('Added [3] items', throw=False))
+
+                # decode errors from the chunk reader are raised
+                badfp = s_common.genpath(dirn, 'bad.jsonl')
+                with s_common.genfile(badfp) as fd:
+                    fd.write(b'[["test:int", 100], {}]\nnewp\n')
+
+                argv = argv[:-1] + [badfp]
+                with self.raises(ValueError):
+                    await s_feed.main(argv, outp=self.getTestOutp())
 
             nodes = await core.nodes('test:int')
             self.len(20, nodes)
 
+    async def test_synnodes_concurrency(self):
+
+        async with self.getTestCore() as core:
+
+            await self.addCreatorDeleterRoles(core)
+
+            host, port = await core.dmon.listen('tcp://127.0.0.1:0/')
+            curl = f'tcp://icanadd:secret@{host}:{port}/'
+
+            with self.getTestDir() as dirn:
+
+                paths = []
+                for n in range(3):
+                    mpkfp = s_common.genpath(dirn, f'podes{n}.mpk')
+                    with s_common.genfile(mpkfp) as fd:
+                        for i in range(10):
+                            pode = (('test:int', n * 10 + i), {})
+                            fd.write(s_msgpack.en(pode))
+                    paths.append(mpkfp)
+
+                # track how many files are being ingested at once
+                inflight = []
+                maxinflight = []
+                addFeedItems = s_feed._addFeedItems
+
+                async def trackFeedItems(*args, **kwargs):
+                    inflight.append(1)
+                    maxinflight.append(len(inflight))
+                    try:
+                        await asyncio.sleep(0.1)
+                        return await addFeedItems(*args, **kwargs)
+                    finally:
+                        inflight.pop()
+
+                argv = ['--cortex', curl,
+                        '--format', 'syn.nodes',
+                        '--modules', 'synapse.tests.utils.TestModule',
+                        '--chunksize', '3',
+                        '--concurrency', '2'] + paths
+
+                outp = self.getTestOutp()
+                with mock.patch('synapse.tools.feed._addFeedItems', trackFeedItems):
+                    self.eq(await s_feed.main(argv, outp=outp), 0)
+
+                self.len(3, maxinflight)
+                self.eq(max(maxinflight), 2)
+
+                # files are ingested one at a time by default
+                maxinflight.clear()
+                argv = ['--cortex', curl, '--modules', 'synapse.tests.utils.TestModule'] + paths
+
+                outp = self.getTestOutp()
+                with mock.patch('synapse.tools.feed._addFeedItems', trackFeedItems):
+                    self.eq(await s_feed.main(argv, outp=outp), 0)
+
+                self.eq(maxinflight, [1, 1, 1])
+
+                outp = self.getTestOutp()
+                argv = ['--cortex', curl, '--concurrency', '0'] + paths
+                self.eq(await s_feed.main(argv, outp=outp), 1)
+                self.true(outp.expect('Concurrency must be at least 1.'))
+
+            nodes = await core.nodes('test:int')
+            self.len(30, nodes)
+
+    def test_feed_getitems(self):
+
+        with self.getTestDir() as dirn:
+
+            jsonfp = s_common.genpath(dirn, 'podes.json')
+            s_common.jssave([(('test:int', 1), {})], jsonfp)
+
+            jsonlfp = s_common.genpath(dirn, 'podes.jsonl')
+            with s_common.genfile(jsonlfp) as fd:
+                for i in range(3):
+                    fd.write(json.dumps((('test:int', i), {})).encode() + b'\n')
+
+            genr = s_feed.getItems(jsonfp, jsonlfp)
+
+            path, bname, items = next(genr)
+            self.eq(path, jsonfp)
+            self.eq(bname, 'podes.json')
+            self.eq(list(items), [[['test:int', 1], {}]])
+
+            # jsonl items are streamed from the file
+            path, bname, items = next(genr)
+            self.eq(path, jsonlfp)
+            self.eq(bname, 'podes.jsonl')
+            self.false(isinstance(items, list))
+            self.len(3, list(items))
+
+            self.none(next(genr, None))
+
+            # integers outside of 64 bits must survive decoding exactly
+            bigvalu = 2 ** 80 + 1
+            bigfp = s_common.genpath(dirn, 'big.jsonl')
+            with s_common.genfile(bigfp) as fd:
+                fd.write(json.dumps((('test:str', 'big'), {'props': {'valu': bigvalu}})).encode() + b'\n')
+
+            bigjsonfp = s_common.genpath(dirn, 'big.json')
+            s_common.jssave([(('test:str', 'big'), {'props': {'valu': bigvalu}})], bigjsonfp)
+
+            for _, _, items in s_feed.getItems(bigfp, bigjsonfp):
+                items = list(items)
+                self.len(1, items)
+                self.eq(items[0][1]['props']['valu'], bigvalu)
+                self.isinstance(items[0][1]['props']['valu'], int)
+
+    async def test_feed_close(self):
+
+        closed = []
+
+        def genr():
+            try:
+                for i in range(10):
+                    yield (('test:int', i), {})
+            finally:
+                closed.append(True)
+
+        class FailCore:
+            async def addFeedData(self, feedformat, items, viewiden=None):
+                raise s_exc.BadArg(mesg='newp')
+
+        # the item generator is closed when sending fails
+        outp = self.getTestOutp()
+        with self.raises(s_exc.BadArg):
+            await s_feed._addFeedItems(FailCore(), outp, 'syn.nodes', 'podes.mpk', 'podes.mpk', genr(), chunksize=3)
+
+        self.eq(closed, [True])
+
     async def test_synnodes_offset(self):
 
         async with self.getTestCore() as core:
@@ -110,8 +255,10 @@ class FeedTest(s_t_utils.SynTest):
                 self.eq(await s_feed.main(argv, outp=outp), 1)
                 self.true(outp.expect('Cannot start from a arbitrary offset for more than 1 file.'))
 
+            # only the items at and after the offset are added
             nodes = await core.nodes('test:int')
-            self.len(8, nodes)
+            self.len(5, nodes)
+            self.eq([15, 16, 17, 18, 19], sorted(n.ndef[1] for n in nodes))
 
     async def test_synnodes_view(self):
 
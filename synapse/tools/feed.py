@@ -4,6 +4,8 @@ import time
 import asyncio
 import logging
 import argparse
+import itertools
+import threading
 
 import synapse.exc as s_exc
 import synapse.common as s_common
@@ -11,68 +13,165 @@ import synapse.cortex as s_cortex
 import synapse.telepath as s_telepath
 
 import synapse.lib.cmdr as s_cmdr
+import synapse.lib.coro as s_coro
 import synapse.lib.output as s_output
 import synapse.lib.msgpack as s_msgpack
 import synapse.lib.version as s_version
-import synapse.lib.encoding as s_encoding
 
 logger = logging.getLogger(__name__)
 
 reqver = '>=0.2.0,<3.0.0'
 
-def getItems(*paths):
-    items = []
+# minimum number of seconds between progress messages for a file
+reportinterval = 1.0
+
+def _loadJsonFile(path):
+    with s_common.genfile(path) as fd:
+        byts = fd.read()
+        if not byts:
+            return None
+
+        return s_common.jsonloads(byts)
+
+def _sliceItems(item, offset):
+    # a single document is treated as a list of one item
+    if not isinstance(item, list):
+        item = [item]
+    return item[offset:]
+
+def _iterJsonFile(path, offset=0):
+    # a generator so the file is parsed by the first nextchunk() in the executor
+    yield from _sliceItems(_loadJsonFile(path), offset)
+
+def _iterJsonlFile(path, offset=0):
+    with s_common.genfile(path) as fd:
+        for line in itertools.islice(fd, offset, None):
+            yield s_common.jsonloads(line)
+
+def _iterYamlFile(path, offset=0):
+    yield from _sliceItems(s_common.yamlload(path), offset)
+
+def _iterMsgpackFile(path, offset=0):
+    return s_msgpack.iterfile(path, since=offset - 1)
+
+itemloaders = {
+    '.json': _iterJsonFile,
+    '.jsonl': _iterJsonlFile,
+    '.yaml': _iterYamlFile,
+    '.yml': _iterYamlFile,
+    '.mpk': _iterMsgpackFile,
+    '.nodes': _iterMsgpackFile,
+}
+
+def getItems(*paths, offset=0):
+    '''
+    Yield (path, basename, items) tuples for the given feed files.
+
+    Files are only opened and parsed once their items are iterated, and
+    jsonl/msgpack items are streamed from disk rather than loaded up front.
+    The first offset items of each file are skipped.
+    '''
     for path in paths:
-        if path.endswith('.json'):
-            item = s_common.jsload(path)
-            if not isinstance(item, list):
-                item = [item]
-            items.append((path, item))
-        elif path.endswith('.jsonl'):
-            with s_common.genfile(path) as fd:
-                item = list(s_encoding.iterdata(fd, False, format='jsonl'))
-                items.append((path, item))
-        elif path.endswith(('.yaml', '.yml')):
-            item = s_common.yamlload(path)
-            if not isinstance(item, list):
-                item = [item]
-            items.append((path, item))
-        elif path.endswith('.mpk') or path.endswith('.nodes'):
-            genr = s_msgpack.iterfile(path)
-            items.append((path, genr))
-        else:  # pragma: no cover
+
+        loader = itemloaders.get(os.path.splitext(path)[1].lower())
+        if loader is None:  # pragma: no cover
             logger.warning('Unsupported file path: [%s]', path)
-    return items
+            continue
+
+        yield (path, os.path.basename(path), loader(path, offset=offset))
+
+async def _addFeedItems(core, outp, feedformat, path, bname, item, chunksize=1000, offset=0, viewiden=None):
+
+    tick = time.time()
+    outp.printf(f'Adding items from [{path}]')
+
+    foff = offset
+
+    # progress is reported at most once per interval rather than per chunk
+    lastoff = offset
+    lastreport = time.monotonic()
 
-async def addFeedData(core, outp, feedformat, debug=False, *paths, chunksize=1000, offset=0, viewiden=None):
+    addFeedData = core.addFeedData
 
-    items = getItems(*paths)
-    for path, item in items:
+    # islice batches loaded documents and streamed items alike
+    genr = iter(item)
 
-        bname = os.path.basename(path)
+    # the generator may still be running in the executor when the reader is cancelled
+    genrlock = threading.Lock()
 
-        tick = time.time()
-        outp.printf(f'Adding items from [{path}]')
+    def nextchunk():
+        with genrlock:
+            return tuple(itertools.islice(genr, chunksize))
 
-        foff = 0
-        for chunk in s_common.chunks(item, chunksize):
+    def closegenr():
+        with genrlock:
+            close = getattr(genr, 'close', None)
+            if close is not None:
+                close()
 
-            clen = len(chunk)
-            if offset and foff + clen < offset:
-                # We have not yet encountered a chunk which
-                # will include the offset size.
-                foff += clen
-                continue
+    # read and decode the next chunks in the executor while the current one is sent
+    chunkq = asyncio.Queue(maxsize=2)
 
-            await core.addFeedData(feedformat, chunk, viewiden=viewiden)
+    async def readchunks():
+        try:
+            while chunk := await s_coro.executor(nextchunk):
+                await chunkq.put(chunk)
+            await chunkq.put(None)
 
-            foff += clen
-            outp.printf(f'Added [{clen}] items from [{bname}] - offset [{foff}]')
+        except asyncio.CancelledError:  # pragma: no cover
+            raise
 
-        tock = time.time()
+        except Exception as e:
+            await chunkq.put(e)
 
-        outp.printf(f'Done consuming from [{bname}]')
-        outp.printf(f'Took [{tock - tick}] seconds.')
+    reader = asyncio.create_task(readchunks())
+    try:
+
+        while (chunk := await chunkq.get()) is not None:
+
+            if isinstance(chunk, Exception):
+                raise chunk
+
+            await addFeedData(feedformat, chunk, viewiden=viewiden)
+            foff += len(chunk)
+
+            now = time.monotonic()
+            if now - lastreport >= reportinterval:
+                outp.printf(f'Added [{foff - lastoff}] items from [{bname}] - offset [{foff}]')
+                lastoff = foff
+                lastreport = now
+
+    finally:
+        reader.cancel()
+        # close any open file handle once the last nextchunk() call is done
+        await s_coro.executor(closegenr)
+
+    if foff > lastoff:
+        outp.printf(f'Added [{foff - lastoff}] items from [{bname}] - offset [{foff}]')
+
+    tock = time.time()
+
+    outp.printf(f'Done consuming from [{bname}]')
+    outp.printf(f'Took [{tock - tick}] seconds.')
+
+async def addFeedData(core, outp, feedformat, debug=False, *paths, chunksize=1000, offset=0, viewiden=None,
+                      concurrency=1):
+
+    sema = asyncio.Semaphore(concurrency)
+
+    async def feedPath(path):
+        # only open the file once a slot is available
+        async with sema:
+            for path, bname, item in getItems(path, offset=offset):
+                await _addFeedItems(core, outp, feedformat, path, bname, item,
+                                    chunksize=chunksize, offset=offset, viewiden=viewiden)
+
+    tasks = [asyncio.create_task(feedPath(path)) for path in paths]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
 
     if debug:
         await s_cmdr.runItemCmdr(core, outp, True)
@@ -82,8 +181,11 @@ async def main(argv, outp=None):
     if outp is None:  # pragma: no cover
         outp = s_output.OutPut()
 
-    pars = makeargparser()
-    opts = pars.parse_args(argv)
+    opts = _argparser.parse_args(argv)
+
+    if opts.concurrency < 1:
+        outp.printf('Concurrency must be at least 1.')
+        return 1
 
     if opts.offset:
         if len(opts.files) > 1:
@@ -98,6 +200,7 @@ async def main(argv, outp=None):
             await addFeedData(prox, outp, opts.format, opts.debug,
                         chunksize=opts.chunksize,
                         offset=opts.offset,
+                        concurrency=opts.concurrency,
                         *opts.files)
 
     elif opts.cortex:
@@ -114,6 +217,7 @@ async def main(argv, outp=None):
                 await addFeedData(core, outp, opts.format, opts.debug,
                                   chunksize=opts.chunksize,
                                   offset=opts.offset, viewiden=opts.view,
+                                  concurrency=opts.concurrency,
                                   *opts.files)
 
     else:  # pragma: no cover
@@ -144,10 +248,16 @@ def makeargparser():
                       help='Item offset to start consuming data from.')
     pars.add_argument('--view', type=str, action='store', default=None,
                       help='The View to ingest the data into.')
+    pars.add_argument('--concurrency', type=int, action='store', default=1,
+                      help='Maximum number of files to ingest at the same time (files may be '
+                           'ingested out of order when greater than 1).')
     pars.add_argument('files', nargs='*', help='json/yaml/msgpack feed files')
 
     return pars
 
+# parsing does not modify the parser, so main() shares one instance
+_argparser = makeargparser()
+
 if __name__ == '__main__':  # pragma: no cover
     s_common.setlogging(logger, 'DEBUG')
     asyncio.run(main(sys.argv[1:]))